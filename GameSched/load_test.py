@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Synthetic load generator for the CPU Scheduling Game server
+Spins up N simulated Socket.IO clients in-process and reports frame jitter,
+dropped frames, tick overrun and bandwidth per client as JSON
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+from web_game_engine import ALGORITHMS, LEVEL_CONFIGS
+from web_metrics import TARGET_TICK_INTERVAL
+
+DIFFICULTIES = ['easy', 'normal', 'hard', 'super_hard']
+ALGORITHM_COUNT = len(ALGORITHMS)
+MOVES = [(0, -1), (0, 1), (-1, 0), (1, 0), (1, -1), (1, 1)]
+
+
+def start_local_server(port):
+    """Start web_server in a daemon thread and wait until it accepts requests"""
+    from web_server import app, socketio
+
+    server_thread = threading.Thread(
+        target=socketio.run,
+        args=(app,),
+        kwargs={'host': '127.0.0.1', 'port': port, 'allow_unsafe_werkzeug': True, 'log_output': False}
+    )
+    server_thread.daemon = True
+    server_thread.start()
+
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + '/metrics', timeout=1).read()
+            return url
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def scrape_metrics(url):
+    """Read the /metrics counters needed for the report"""
+    text = urllib.request.urlopen(url + '/metrics', timeout=5).read().decode()
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SimulatedClient:
+    def __init__(self, client_id, url, move_rate):
+        import socketio
+
+        self.client_id = client_id
+        self.url = url
+        self.move_rate = move_rate
+        self.sio = socketio.Client(reconnection=False)
+        self.recording = False
+        self.sid = None
+        # (arrival time, frame sequence number) of each recorded game_update
+        self.frames = []
+        self.moves_sent = 0
+        self.stop_event = threading.Event()
+        self.input_thread = None
+        self.sio.on('game_update', self.on_game_update)
+
+    def on_game_update(self, data):
+        if self.recording and 'frame' in data:
+            self.frames.append((time.perf_counter(), data['frame']))
+
+    def connect(self):
+        self.sio.connect(self.url)
+        self.sid = self.sio.get_sid()
+
+    def configure(self, difficulty, algorithm):
+        # The server runs one shared game, so only one client sets it up
+        self.sio.emit('select_difficulty', {'difficulty': difficulty})
+        self.sio.emit('select_algorithm', {'index': algorithm})
+        self.sio.emit('start_game')
+
+    def start(self):
+        self.input_thread = threading.Thread(target=self.send_moves)
+        self.input_thread.daemon = True
+        self.input_thread.start()
+
+    def send_moves(self):
+        # Key presses arrive in short bursts separated by pauses, like a player
+        while not self.stop_event.is_set():
+            dx, dy = random.choice(MOVES)
+            for _ in range(random.randint(1, 6)):
+                if self.stop_event.is_set():
+                    return
+                self.sio.emit('player_move', {'dx': dx, 'dy': dy})
+                self.moves_sent += 1
+                self.stop_event.wait(random.uniform(0.5, 1.5) / self.move_rate)
+            self.stop_event.wait(random.uniform(0.0, 0.3))
+
+    def stop(self):
+        self.stop_event.set()
+        if self.input_thread:
+            self.input_thread.join(timeout=1)
+        self.sio.disconnect()
+
+    def report(self, duration, server_stats):
+        """
+        server_stats holds this client's update_rate and frames_conflated over the window, from
+        /metrics. Frames the server skipped on purpose (conflation, a lower update rate) are
+        frames_skipped; only skips the server did not account for count as dropped.
+        """
+        pairs = list(zip(self.frames, self.frames[1:]))
+        intervals = [b[0] - a[0] for a, b in pairs]
+        # Expected spacing is one server tick per frame number, whatever rate the client is on
+        jitter = [abs((b[0] - a[0]) - (b[1] - a[1]) * TARGET_TICK_INTERVAL) for a, b in pairs]
+        skipped = sum(max(0, b[1] - a[1] - 1) for a, b in pairs)
+        return {
+            'client': self.client_id,
+            'update_rate': server_stats['update_rate'],
+            'frames_received': len(self.frames),
+            'frames_skipped': skipped,
+            'frames_conflated': server_stats['frames_conflated'],
+            'frames_dropped': max(0, skipped - server_stats['frames_conflated']),
+            'moves_sent': self.moves_sent,
+            'fps': len(self.frames) / duration if duration > 0 else 0.0,
+            'interval_mean_ms': statistics.mean(intervals) * 1000 if intervals else 0.0,
+            'interval_stdev_ms': statistics.pstdev(intervals) * 1000 if intervals else 0.0,
+            'jitter_p50_ms': percentile(jitter, 0.50) * 1000,
+            'jitter_p95_ms': percentile(jitter, 0.95) * 1000,
+            'jitter_p99_ms': percentile(jitter, 0.99) * 1000,
+            'interval_max_ms': max(intervals) * 1000 if intervals else 0.0
+        }
+
+
+def client_stats(before, after, sid):
+    """A client's current update rate and frames conflated between two scrapes"""
+    label = f'{{client="{sid}"}}'
+    conflated = 'gamesched_client_frames_conflated_total' + label
+    return {
+        'update_rate': after.get('gamesched_client_update_rate' + label, 0),
+        'frames_conflated': int(after.get(conflated, 0) - before.get(conflated, 0))
+    }
+
+
+def summarise_server(before, after, duration, client_count):
+    ticks = after.get('gamesched_ticks_total', 0) - before.get('gamesched_ticks_total', 0)
+    emitted = after.get('gamesched_emitted_bytes_total', 0) - before.get('gamesched_emitted_bytes_total', 0)
+    latency_count = after.get('gamesched_tick_latency_seconds_count', 0) - before.get('gamesched_tick_latency_seconds_count', 0)
+    latency_sum = after.get('gamesched_tick_latency_seconds_sum', 0) - before.get('gamesched_tick_latency_seconds_sum', 0)
+    # Overruns are ticks that finished after their slot on the 30 Hz schedule
+    intervals = after.get('gamesched_tick_interval_seconds_count', 0) - before.get('gamesched_tick_interval_seconds_count', 0)
+    interval_sum = after.get('gamesched_tick_interval_seconds_sum', 0) - before.get('gamesched_tick_interval_seconds_sum', 0)
+    overruns = after.get('gamesched_tick_overruns_total', 0) - before.get('gamesched_tick_overruns_total', 0)
+    return {
+        'ticks': ticks,
+        'tick_rate': ticks / duration if duration > 0 else 0.0,
+        'tick_latency_mean_ms': latency_sum / latency_count * 1000 if latency_count else 0.0,
+        'tick_interval_mean_ms': interval_sum / intervals * 1000 if intervals else 0.0,
+        'tick_overruns': overruns,
+        'tick_overrun_ratio': overruns / intervals if intervals else 0.0,
+        'bytes_per_second': emitted / duration if duration > 0 else 0.0,
+        'bytes_per_second_per_client': emitted / duration / max(1, client_count) if duration > 0 else 0.0
+    }
+
+
+def summarise_clients(reports):
+    if not reports:
+        return {}
+    return {
+        'frames_received': sum(r['frames_received'] for r in reports),
+        'frames_skipped': sum(r['frames_skipped'] for r in reports),
+        'frames_dropped': sum(r['frames_dropped'] for r in reports),
+        'fps_mean': statistics.mean(r['fps'] for r in reports),
+        'fps_min': min(r['fps'] for r in reports),
+        'jitter_p95_ms_max': max(r['jitter_p95_ms'] for r in reports),
+        'jitter_p99_ms_max': max(r['jitter_p99_ms'] for r in reports),
+        'interval_max_ms': max(r['interval_max_ms'] for r in reports)
+    }
+
+
+def run_load_test(url, client_count, duration, warmup, move_rate, difficulty, algorithm):
+    clients = [SimulatedClient(i, url, move_rate) for i in range(client_count)]
+    # Every connect resets the shared game, so configure it once all clients are in
+    for client in clients:
+        client.connect()
+    clients[0].configure(difficulty, algorithm)
+    time.sleep(0.5)
+    for client in clients:
+        client.start()
+    time.sleep(warmup)
+
+    before = scrape_metrics(url)
+    for client in clients:
+        client.recording = True
+    started = time.perf_counter()
+    time.sleep(duration)
+    for client in clients:
+        client.recording = False
+    elapsed = time.perf_counter() - started
+    after = scrape_metrics(url)
+
+    for client in clients:
+        client.stop()
+
+    reports = [client.report(elapsed, client_stats(before, after, client.sid)) for client in clients]
+    return {
+        'clients': summarise_clients(reports),
+        'server': summarise_server(before, after, elapsed, client_count),
+        'per_client': reports,
+        'duration': elapsed
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the CPU Scheduling Game server")
+    parser.add_argument('--clients', type=int, default=10, help="number of simulated clients")
+    parser.add_argument('--duration', type=float, default=30.0, help="measurement window in seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="seconds to run before measuring")
+    parser.add_argument('--move-rate', type=float, default=8.0, help="average player_move events per second per client")
+    parser.add_argument('--difficulty', choices=list(LEVEL_CONFIGS),
+                        help="level the shared game runs, e.g. stress_medium (default: random)")
+    parser.add_argument('--algorithm', type=int, choices=range(ALGORITHM_COUNT), metavar='INDEX',
+                        help="select_algorithm index the shared game runs (default: random)")
+    parser.add_argument('--url', help="target an already running server instead of starting one")
+    parser.add_argument('--port', type=int, default=5055, help="port for the locally started server")
+    parser.add_argument('--label', default='', help="free-form label stored in the report, e.g. a git revision")
+    parser.add_argument('--seed', type=int, help="random seed for client behaviour")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    try:
+        # The Socket.IO client transports are optional extras of python-socketio
+        import requests  # noqa: F401
+        import websocket  # noqa: F401
+    except ImportError as e:
+        print(f"Socket.IO client unavailable: {e}")
+        print('Install it with: pip install "python-socketio[client]==5.8.0"')
+        sys.exit(1)
+
+    difficulty = args.difficulty or random.choice(DIFFICULTIES)
+    algorithm = args.algorithm if args.algorithm is not None else random.randrange(ALGORITHM_COUNT)
+
+    url = args.url or start_local_server(args.port)
+    print(f"Running {args.clients} clients against {url} for {args.duration:.0f}s "
+          f"({difficulty}, algorithm {algorithm})")
+
+    result = run_load_test(url, args.clients, args.duration, args.warmup, args.move_rate, difficulty, algorithm)
+    report = {
+        'label': args.label,
+        'config': {
+            'clients': args.clients,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'move_rate': args.move_rate,
+            'difficulty': difficulty,
+            'algorithm_index': algorithm,
+            'seed': args.seed
+        },
+        **result
+    }
+
+    server = report['server']
+    clients = report['clients']
+    print(f"Server tick rate:      {server['tick_rate']:.1f}/s (target 30)")
+    print(f"Tick latency (mean):   {server['tick_latency_mean_ms']:.2f}ms")
+    print(f"Tick interval (mean):  {server['tick_interval_mean_ms']:.2f}ms (target 33.33ms)")
+    print(f"Tick overruns:         {server['tick_overruns']:.0f} ({server['tick_overrun_ratio']:.1%})")
+    print(f"Bandwidth per client:  {server['bytes_per_second_per_client'] / 1024:.1f} KiB/s")
+    print(f"Client FPS mean/min:   {clients.get('fps_mean', 0):.1f} / {clients.get('fps_min', 0):.1f}")
+    print(f"Jitter p95/p99 (max):  {clients.get('jitter_p95_ms_max', 0):.1f}ms / {clients.get('jitter_p99_ms_max', 0):.1f}ms")
+    print(f"Skipped frames:        {clients.get('frames_skipped', 0)} (conflated or reduced rate)")
+    print(f"Dropped frames:        {clients.get('frames_dropped', 0):.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,18 @@ const algorithmEffects = {
         "• Real-time performance", 
         "• Optimal for gaming",
         "• Can interrupt low priority processes"
+    ],
+    "Shortest Remaining Time First": [
+        "• Preemptive version of SJF",
+        "• Shorter arrivals interrupt the running task",
+        "• Lowest average waiting time",
+        "• Long tasks may starve"
+    ],
+    "Multilevel Feedback Queue": [
+        "• New processes start at top priority",
+        "• Using a full time slice drops a level",
+        "• Periodic boost prevents starvation",
+        "• Closest to real OS schedulers"
     ]
 };
 
@@ -61,6 +73,11 @@ document.getElementById('difficultySelect').onchange = (e) => {
     socket.emit('select_difficulty', {difficulty: e.target.value});
 };
 
+// Simulation speed handler
+document.getElementById('speedSelect').onchange = (e) => {
+    socket.emit('set_speed', {speed: parseFloat(e.target.value)});
+};
+
 // Algorithm dropdown handler
 document.getElementById('algorithmSelect').onchange = (e) => {
     socket.emit('select_algorithm', {index: parseInt(e.target.value)});
@@ -91,7 +108,9 @@ function updateUI() {
         'Round Robin',
         'Shortest Job First',
         'Priority (Non-Preemptive)',
-        'Priority (Preemptive)'
+        'Priority (Preemptive)',
+        'Shortest Remaining Time First',
+        'Multilevel Feedback Queue'
     ];
     const currentIndex = algorithmNames.indexOf(gameState.scheduler.name);
     if (currentIndex >= 0) {
@@ -242,6 +261,22 @@ function updateOSStatus() {
                 message = 'Preemptive Priority: Best for real-time systems. High priority processes can interrupt low priority ones.';
             }
             break;
+            
+        case 'Shortest Remaining Time First':
+            if (runningProcess) {
+                message = `⏱️ SRTF: Process with ${runningProcess.remaining_time.toFixed(1)}s left is running. A shorter arrival will preempt it.`;
+            } else {
+                message = 'SRTF: Always runs the process with the least remaining time, preempting longer ones.';
+            }
+            break;
+            
+        case 'Multilevel Feedback Queue':
+            if (runningProcess) {
+                message = '📶 MLFQ: Processes that use their whole time slice drop to a lower level with a longer slice.';
+            } else {
+                message = 'MLFQ: New and interactive processes stay on top; all processes are boosted back up periodically.';
+            }
+            break;
     }
     
     schedulerMessageEl.textContent = message;
@@ -287,17 +322,23 @@ function drawGame() {
     ctx.clearRect(0, 0, canvas.width, canvas.height);
     drawArcadeBackground();
     
+    // Stress levels use a larger arena, scaled down to fit the canvas
+    const arenaWidth = gameState.game.width || canvas.width;
+    const arenaHeight = gameState.game.height || canvas.height;
+    ctx.save();
+    ctx.scale(canvas.width / arenaWidth, canvas.height / arenaHeight);
+    
     // Draw start line
     ctx.strokeStyle = '#10B981';
     ctx.lineWidth = 4;
     ctx.beginPath();
     ctx.moveTo(gameState.game.start_line_x, 50);
-    ctx.lineTo(gameState.game.start_line_x, 350);
+    ctx.lineTo(gameState.game.start_line_x, arenaHeight - 50);
     ctx.stroke();
     
     ctx.fillStyle = '#10B981';
     ctx.font = '14px Arial';
-    ctx.fillText('START', gameState.game.start_line_x - 15, 370);
+    ctx.fillText('START', gameState.game.start_line_x - 15, arenaHeight - 30);
     
     // Draw finish line
     const allLocksUnlocked = gameState.locks && gameState.locks.length === 0;
@@ -305,12 +346,13 @@ function drawGame() {
     ctx.lineWidth = 4;
     ctx.beginPath();
     ctx.moveTo(gameState.game.finish_line_x, 50);
-    ctx.lineTo(gameState.game.finish_line_x, 350);
+    ctx.lineTo(gameState.game.finish_line_x, arenaHeight - 50);
     ctx.stroke();
     
     ctx.fillStyle = allLocksUnlocked ? '#10B981' : '#6B7280';
     ctx.font = '14px Arial';
-    ctx.fillText(allLocksUnlocked ? 'FINISH' : 'UNLOCK ALL LOCKS', gameState.game.finish_line_x - 35, 370);
+    ctx.fillText(allLocksUnlocked ? 'FINISH' : 'UNLOCK ALL LOCKS', gameState.game.finish_line_x - 35, arenaHeight - 30);
+    ctx.restore();
     
     // Draw difficulty and CPU scheduler indicator
     ctx.fillStyle = '#8B5CF6';
@@ -324,6 +366,9 @@ function drawGame() {
         ctx.fillText(`BOSSES REMAINING: ${gameState.game.bosses_remaining} - Collect sword to defeat them!`, 10, 45);
     }
     
+    ctx.save();
+    ctx.scale(canvas.width / arenaWidth, canvas.height / arenaHeight);
+    
     // Draw player
     drawEntity(gameState.player, '#10B981', 'USER');
     
@@ -383,6 +428,7 @@ function drawGame() {
             ctx.fillText('🔒', lock.x - 11, lock.y + 8);
         });
     }
+    ctx.restore();
     
     // Draw hearts for lives
     ctx.font = '20px Arial';
@@ -395,7 +441,7 @@ function drawGame() {
     }
     
     ctx.fillStyle = '#00FFFF';
-    ctx.fillText(`Keys: ${gameState.game.keys_collected}/3`, 10, 70);
+    ctx.fillText(`Keys: ${gameState.game.keys_collected}/${gameState.game.keys_total || 3}`, 10, 70);
     
     if (gameState.game.boss_items_collected !== undefined) {
         ctx.fillStyle = '#FF69B4';
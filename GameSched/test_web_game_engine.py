@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from web_game_engine import ALGORITHMS, COMPLETED_HISTORY_SIZE, MIN_BURST_TIME, LevelConfig, WebLineCrossingGame
+
+# Wall-clock timestamps differ between two copies run one after the other
+WALL_CLOCK_FIELDS = ('level_start_time',)
+
+
+def comparable(state):
+    state = dict(state)
+    for field in WALL_CLOCK_FIELDS:
+        state.pop(field)
+    state['entity_states'] = [{k: v for k, v in entity.items() if k != 'last_update'}
+                              for entity in state['entity_states']]
+    return state
+
+
+def run(game, frames):
+    for _ in range(frames):
+        game.update(1 / 30)
+
+
+@pytest.mark.parametrize('difficulty', ['easy', 'super_hard', 'stress_small'])
+@pytest.mark.parametrize('algorithm_index', range(len(ALGORITHMS)))
+def test_snapshot_round_trip_through_json(difficulty, algorithm_index):
+    game = WebLineCrossingGame(difficulty, seed=7, high_scores={})
+    game.set_process_speed(8)
+    game.scheduler.select_algorithm(algorithm_index)
+    run(game, 200)
+
+    copy = WebLineCrossingGame.from_snapshot(json.loads(json.dumps(game.snapshot())), high_scores={})
+    assert comparable(copy.snapshot()) == comparable(game.snapshot())
+
+    run(game, 200)
+    run(copy, 200)
+    assert comparable(copy.snapshot()) == comparable(game.snapshot())
+
+
+def test_snapshot_keeps_only_recent_completed_processes():
+    game = WebLineCrossingGame('stress_small', seed=3, high_scores={})
+    game.set_process_speed(64)
+    run(game, 300)
+
+    state = game.snapshot()['scheduler']
+    assert state['completed_count'] > COMPLETED_HISTORY_SIZE
+    assert len(state['completed_processes']) == COMPLETED_HISTORY_SIZE
+    assert game.get_state()['scheduler']['completed_processes'] == state['completed_count']
+
+
+@pytest.mark.parametrize('overrides', [
+    {'enemy_count': -3},
+    {'key_count': -1},
+    {'arena_width': 0},
+    {'arena_height': -400},
+    {'player_burst': (0, 0)},
+    {'enemy_burst': (2.0, 1.0)},
+    {'boss_burst': (-1.0, 1.0)},
+])
+def test_level_config_rejects_invalid_values(overrides):
+    with pytest.raises(ValueError):
+        LevelConfig(**overrides)
+
+
+def test_zero_bursts_are_raised_to_the_minimum():
+    game = WebLineCrossingGame(seed=1, high_scores={})
+    game.scheduler.burst_distributions = {'player': (0, 0), 'enemy': (0, 0), 'boss': (0, 0)}
+    game.set_process_speed(64)
+    run(game, 5)
+
+    assert game.scheduler.completed_count > 0
+    assert all(p.burst_time == MIN_BURST_TIME for p in game.scheduler.completed_processes)
@@ -0,0 +1,111 @@
+import pytest
+
+from web_game_engine import ALGORITHMS, WebProcess, WebScheduler
+
+
+def make_scheduler(algorithm_type, bursts):
+    scheduler = WebScheduler()
+    scheduler.set_algorithm(next(a for a in ALGORITHMS if a['type'] == algorithm_type))
+    for pid, burst in enumerate(bursts, start=1):
+        scheduler.enqueue(WebProcess(pid, 0, burst, priority=pid % 3))
+    return scheduler
+
+
+def completions(scheduler):
+    return [(p.pid, round(p.completion_time, 6)) for p in scheduler.completed_processes]
+
+
+def test_srtf_preempts_for_shorter_arrival():
+    scheduler = make_scheduler('srtf', [3.0])
+    scheduler.update(1.0)
+    assert scheduler.running_process.pid == 1
+
+    scheduler.enqueue(WebProcess(2, scheduler.current_time, 0.5))
+    scheduler.update(0.1)
+    assert scheduler.running_process.pid == 2
+    assert [p.pid for p in scheduler.ready_queue] == [1]
+
+    scheduler.update(0.4)
+    assert completions(scheduler) == [(2, 1.5)]
+    assert scheduler.running_process.pid == 1
+    assert scheduler.running_process.remaining_time == pytest.approx(2.0)
+
+
+def test_srtf_keeps_running_process_when_arrival_is_longer():
+    scheduler = make_scheduler('srtf', [1.0])
+    scheduler.update(0.5)
+    scheduler.enqueue(WebProcess(2, scheduler.current_time, 2.0))
+    scheduler.update(0.1)
+    assert scheduler.running_process.pid == 1
+
+
+def test_mlfq_demotes_after_quantum():
+    scheduler = make_scheduler('mlfq', [10.0, 10.0])
+    first = scheduler.ready_queue.order(1)[0]
+
+    scheduler.update(0.5)
+    assert first.mlfq_level == 1
+    assert scheduler.running_process.pid == 2
+
+    scheduler.update(0.5)
+    # Level 1 runs for twice the base quantum
+    assert scheduler.running_process.pid == 1
+    scheduler.update(0.9)
+    assert scheduler.running_process.pid == 1
+    scheduler.update(0.1)
+    assert first.mlfq_level == 2
+
+
+def test_mlfq_boost_returns_everyone_to_top_level():
+    scheduler = make_scheduler('mlfq', [20.0, 20.0, 20.0])
+    scheduler.update(4.5)
+    waiting = list(scheduler.ready_queue)
+    assert all(p.mlfq_level > 0 for p in waiting)
+
+    scheduler.update(0.6)
+    assert all(p.mlfq_level == 0 for p in waiting)
+
+
+def test_mlfq_boost_does_not_cut_the_running_slice_short():
+    scheduler = make_scheduler('mlfq', [20.0, 20.0, 20.0])
+    scheduler.update(4.5)
+    running = scheduler.running_process
+    assert running.mlfq_level == 2
+    assert scheduler.current_quantum_time == pytest.approx(0.0)
+
+    # Boost lands at t=5.0, part-way through a 2 s level 2 slice
+    scheduler.update(1.0)
+    assert scheduler.running_process is running
+    scheduler.update(0.99)
+    assert scheduler.running_process is running
+
+    scheduler.update(0.02)
+    assert scheduler.running_process is not running
+    assert running.mlfq_level == 0
+
+
+def test_switching_algorithm_keeps_arrival_order():
+    scheduler = make_scheduler('sjf', [3.0, 1.0, 2.0, 1.0])
+    assert [p.pid for p in scheduler.ready_queue.order(4)] == [2, 4, 3, 1]
+
+    scheduler.set_algorithm(ALGORITHMS[0])
+    assert [p.pid for p in scheduler.ready_queue.order(4)] == [1, 2, 3, 4]
+
+    scheduler.set_algorithm(ALGORITHMS[2])
+    assert [p.pid for p in scheduler.ready_queue.order(4)] == [2, 4, 3, 1]
+
+
+@pytest.mark.parametrize('algorithm_type', [a['type'] for a in ALGORITHMS])
+def test_one_large_step_matches_many_small_steps(algorithm_type):
+    bursts = [0.7, 2.9, 0.2, 1.4, 3.3, 0.05, 1.0, 2.2]
+    large = make_scheduler(algorithm_type, bursts)
+    small = make_scheduler(algorithm_type, bursts)
+
+    large.update(5.0)
+    for _ in range(150):
+        small.update(5.0 / 150)
+
+    assert completions(large)
+    assert completions(large) == completions(small)
+    assert large.completed_count == small.completed_count
+    assert large.context_switches == small.context_switches
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from flask import Response, render_template, request
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+
+class CachedAsset:
+    """A response body held in memory with its precompressed variants"""
+
+    def __init__(self, body, mimetype):
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.etag = f'"{self.digest}"'
+        self.encodings = {'identity': body}
+
+        if mimetype.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.encodings['gzip'] = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.encodings['br'] = compressed
+
+    def response(self, cache_control):
+        headers = {'ETag': self.etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        if self.etag in request.headers.get('If-None-Match', ''):
+            return Response(status=304, headers=headers)
+
+        encoding = 'identity'
+        for candidate in ('br', 'gzip'):
+            if candidate in self.encodings and request.accept_encodings.quality(candidate) > 0:
+                encoding = candidate
+                break
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(self.encodings[encoding], mimetype=self.mimetype, headers=headers)
+
+
+class AssetCache:
+    """
+    Static files and pages prepared once at startup: static files get content-hashed
+    URLs under /assets/ and templates are rendered ahead of time. In debug mode the
+    cache rebuilds itself when a source file changes.
+    """
+
+    def __init__(self, app, pages=()):
+        self.app = app
+        self.page_names = tuple(pages)
+        self.assets = {}
+        self.hashed = {}
+        self.pages = {}
+        self.signature = None
+        app.jinja_env.globals['asset_url'] = self.url
+
+    def _source_files(self):
+        for folder in (self.app.static_folder, os.path.join(self.app.root_path, self.app.template_folder)):
+            for root, _, files in os.walk(folder):
+                for name in files:
+                    yield os.path.join(root, name)
+
+    def _signature(self):
+        return tuple(sorted((path, os.stat(path).st_mtime_ns) for path in self._source_files()))
+
+    def build(self):
+        assets = {}
+        hashed = {}
+        static_folder = self.app.static_folder
+        for root, _, files in os.walk(static_folder):
+            for name in files:
+                path = os.path.join(root, name)
+                filename = os.path.relpath(path, static_folder).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    body = f.read()
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                asset = CachedAsset(body, mimetype)
+                assets[filename] = asset
+                hashed[self.hashed_name(filename, asset.digest)] = asset
+        self.assets = assets
+        self.hashed = hashed
+
+        # Pages are rendered after assets so asset_url() resolves to the new hashes
+        pages = {}
+        with self.app.app_context():
+            for name in self.page_names:
+                pages[name] = CachedAsset(render_template(name).encode('utf-8'), 'text/html')
+        self.pages = pages
+        self.signature = self._signature()
+
+    def refresh_if_changed(self):
+        if self.app.debug and self._signature() != self.signature:
+            self.build()
+
+    @staticmethod
+    def hashed_name(filename, digest):
+        root, ext = os.path.splitext(filename)
+        return f'{root}.{digest}{ext}'
+
+    def url(self, filename):
+        asset = self.assets.get(filename)
+        if asset is None:
+            return f'/static/{filename}'
+        return f'/assets/{self.hashed_name(filename, asset.digest)}'
+
+    def page_response(self, name):
+        self.refresh_if_changed()
+        return self.pages[name].response(REVALIDATE_CACHE)
+
+    def asset_response(self, hashed_filename):
+        self.refresh_if_changed()
+        asset = self.hashed.get(hashed_filename)
+        if asset is None:
+            return None
+        return asset.response(IMMUTABLE_CACHE)
@@ -2,8 +2,20 @@ import random
 import time
 import json
 import os
-from dataclasses import dataclass
+import copy
+import math
+from collections import deque
+from dataclasses import dataclass, asdict
 from typing import List, Dict, Any
+from web_metrics import Histogram, SCHEDULING_TIME_BUCKETS
+from web_policies import make_policy
+
+# Queue entries carried in every game_update; the rest is paged via request_queue
+QUEUE_PREVIEW_SIZE = 8
+QUEUE_PAGE_SIZE = 25
+MAX_QUEUE_PAGE_SIZE = 100
+# Completed processes kept for the process table; older ones only count towards completed_count
+COMPLETED_HISTORY_SIZE = 10
 
 @dataclass
 class WebEntity:
@@ -22,6 +34,79 @@ class WebEntity:
         self.start_y = self.y
         self.color = (0, 255, 0) if self.entity_type == 'player' else (255, 0, 0)
 
+def place_entity(entity, x, y):
+    entity.x = x
+    entity.y = y
+    entity.start_x = x
+    entity.start_y = y
+
+def entity_to_state(entity):
+    state = dict(vars(entity))
+    state['color'] = list(entity.color)
+    if 'swords' in state:
+        state['swords'] = list(state['swords'])
+    return state
+
+def entity_from_state(state):
+    entity = WebEntity.__new__(WebEntity)
+    entity.__dict__.update(state)
+    entity.color = tuple(entity.color)
+    if 'swords' in state:
+        entity.swords = list(state['swords'])
+    return entity
+
+@dataclass(frozen=True)
+class LevelConfig:
+    """Arena size, entity counts and per-entity burst time ranges (seconds) for a level"""
+    arena_width: int = 800
+    arena_height: int = 400
+    enemy_count: int = 7
+    boss_count: int = 0
+    powerup_count: int = 5
+    key_count: int = 3
+    lock_count: int = 3
+    player_burst: tuple = (2.9, 2.9)
+    enemy_burst: tuple = (2.9, 2.9)
+    boss_burst: tuple = (2.9, 2.9)
+    
+    def __post_init__(self):
+        if self.arena_width <= 0 or self.arena_height <= 0:
+            raise ValueError(f"Arena size must be positive, got {self.arena_width}x{self.arena_height}")
+        for field in ('enemy_count', 'boss_count', 'powerup_count', 'key_count', 'lock_count'):
+            if getattr(self, field) < 0:
+                raise ValueError(f"{field} must not be negative, got {getattr(self, field)}")
+        for field in ('player_burst', 'enemy_burst', 'boss_burst'):
+            burst = getattr(self, field)
+            if len(burst) != 2 or not 0 < burst[0] <= burst[1]:
+                raise ValueError(f"{field} must be a (low, high) range with 0 < low <= high, got {burst}")
+    
+    def burst_distributions(self):
+        return {'player': self.player_burst, 'enemy': self.enemy_burst, 'boss': self.boss_burst}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: tuple(value) if isinstance(value, list) else value for key, value in data.items()})
+
+LEVEL_CONFIGS = {
+    'easy': LevelConfig(enemy_count=7),
+    'normal': LevelConfig(enemy_count=12, player_burst=(1.9, 1.9), enemy_burst=(1.9, 1.9), boss_burst=(1.9, 1.9)),
+    'hard': LevelConfig(enemy_count=7, boss_count=1, player_burst=(1.0, 1.0), enemy_burst=(1.0, 1.0), boss_burst=(1.0, 1.0)),
+    'super_hard': LevelConfig(enemy_count=7, boss_count=2, player_burst=(1.0, 1.0), enemy_burst=(1.0, 1.0), boss_burst=(1.0, 1.0)),
+    # Stress levels for exercising the scheduler and tick loop at scale
+    'stress_small': LevelConfig(arena_width=1600, arena_height=800, enemy_count=50, boss_count=4,
+                                powerup_count=10, key_count=6, lock_count=6,
+                                player_burst=(0.2, 0.6), enemy_burst=(0.1, 1.5), boss_burst=(0.5, 3.0)),
+    'stress_medium': LevelConfig(arena_width=3200, arena_height=1600, enemy_count=200, boss_count=8,
+                                 powerup_count=25, key_count=12, lock_count=12,
+                                 player_burst=(0.2, 0.6), enemy_burst=(0.05, 1.0), boss_burst=(0.5, 3.0)),
+    'stress_large': LevelConfig(arena_width=6400, arena_height=3200, enemy_count=1000, boss_count=16,
+                                powerup_count=60, key_count=24, lock_count=24,
+                                player_burst=(0.2, 0.6), enemy_burst=(0.02, 0.5), boss_burst=(0.5, 3.0))
+}
+
+def level_config(difficulty):
+    return LEVEL_CONFIGS.get(difficulty, LEVEL_CONFIGS['easy'])
+
 class WebProcess:
     def __init__(self, pid, arrival_time, burst_time, priority=0):
         self.pid = pid
@@ -32,19 +117,67 @@ class WebProcess:
         self.entity = None
         self.task_type = 'movement'
 
+# Remaining time below this counts as finished (guards float drift in event stepping)
+STEP_EPSILON = 1e-9
+# Shortest burst a process can get, so completions always move simulated time forward
+MIN_BURST_TIME = 0.01
+# Frame-to-simulation time scale limits and the most engine substeps taken per frame
+MAX_PROCESS_SPEED = 64.0
+MAX_SUBSTEPS = 4
+
+# Algorithms in dropdown order (select_algorithm index)
+ALGORITHMS = [
+    {'name': 'First Come First Serve', 'type': 'fcfs'},
+    {'name': 'Round Robin', 'type': 'rr'},
+    {'name': 'Shortest Job First', 'type': 'sjf'},
+    {'name': 'Priority (Non-Preemptive)', 'type': 'priority'},
+    {'name': 'Priority (Preemptive)', 'type': 'priority_p'},
+    {'name': 'Shortest Remaining Time First', 'type': 'srtf'},
+    {'name': 'Multilevel Feedback Queue', 'type': 'mlfq'}
+]
+
+# Power-up labels to algorithms
+POWERUP_ALGORITHMS = {
+    'SJF': ALGORITHMS[2],
+    'SRTF': ALGORITHMS[5],
+    'Round Robin': ALGORITHMS[1],
+    'Priority (Non-Preemptive)': ALGORITHMS[3],
+    'Priority (Preemptive)': ALGORITHMS[4],
+    'MLFQ': ALGORITHMS[6]
+}
+
+def empty_algorithm_metrics():
+    # Running totals only, so the per-frame payload stays the same size however many processes complete
+    return {'total_time': 0, 'process_count': 0, 'waiting_time_total': 0, 'turnaround_time_total': 0}
+
 class WebScheduler:
-    def __init__(self, difficulty='easy'):
+    def __init__(self, difficulty='easy', burst_distributions=None, rng=None):
         # Start with FCFS
         self.scheduler = {'name': 'First Come First Serve', 'type': 'fcfs'}
         self.current_algorithm_name = 'First Come First Serve'
-        self.ready_queue = []
+        self.time_quantum = 2.0
+        # The active policy owns the ready queue data structure
+        self.ready_queue = make_policy(self.scheduler['type'], self.time_quantum)
         self.running_process = None
-        self.completed_processes = []
+        self.completed_processes = deque(maxlen=COMPLETED_HISTORY_SIZE)
+        self.completed_count = 0
         self.current_time = 0
-        self.time_quantum = 2.0
         self.current_quantum_time = 0
         self.context_switches = 0
         
+        # Queue order among equals: appended processes count up, front insertions count down
+        self.next_queue_seq = 0
+        self.front_queue_seq = 0
+        # id(entity) -> its queued or running process
+        self.entity_processes = {}
+        # id(entity) -> CPU seconds it received during the last update
+        self.run_times = {}
+        
+        # Pre-aggregated telemetry read by /metrics
+        self.dispatch_counts = {}
+        self.waiting_time_histogram = Histogram(SCHEDULING_TIME_BUCKETS)
+        self.turnaround_time_histogram = Histogram(SCHEDULING_TIME_BUCKETS)
+        
         # Time slices based on difficulty
         self.difficulty_time_slices = {
             'easy': 2.9,
@@ -54,198 +187,306 @@ class WebScheduler:
         }
         self.entity_time_slice = self.difficulty_time_slices.get(difficulty, 2.9)
         
+        # Optional (min, max) burst time per entity type, sampled uniformly
+        self.burst_distributions = dict(burst_distributions or {})
+        if 'player' in self.burst_distributions:
+            self.entity_time_slice = sum(self.burst_distributions['player']) / 2
+        self.rng = rng or random.Random()
+        
         # Powerup algorithm timer
         self.powerup_algorithm_timer = 0
         self.powerup_algorithm_duration = 3.0
         self.base_algorithm = {'name': 'First Come First Serve', 'type': 'fcfs'}
         
-        self.algorithm_metrics = {
-            'First Come First Serve': {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []},
-            'Round Robin': {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []},
-            'Shortest Job First': {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []},
-            'Priority (Non-Preemptive)': {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []},
-            'Priority (Preemptive)': {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []}
-        }
+        self.algorithm_metrics = {algorithm['name']: empty_algorithm_metrics() for algorithm in ALGORITHMS}
+        
+        # Called with each completed process while update() is still running, so its entity
+        # can queue a new process at the exact completion time
+        self.on_complete = None
     
     def can_entity_execute(self, entity):
-        if self.running_process and self.running_process.entity == entity:
+        if self.running_process and self.running_process.entity is entity:
             return True
         return False
     
+    def has_process(self, entity):
+        return id(entity) in self.entity_processes
+    
+    def set_algorithm(self, algorithm):
+        """Switch algorithms, moving waiting processes into the new policy's queue"""
+        previous_type = self.scheduler['type']
+        self.scheduler = dict(algorithm)
+        self.current_algorithm_name = self.scheduler['name']
+        if self.scheduler['type'] != previous_type:
+            # Keep arrival order so ties resolve as they would have in the old queue
+            waiting = sorted(self.ready_queue, key=lambda p: p.queue_seq)
+            self.ready_queue = make_policy(self.scheduler['type'], self.time_quantum)
+            for process in waiting:
+                self.ready_queue.add(process)
+    
     def select_algorithm(self, index):
-        algorithms = [
-            {'name': 'First Come First Serve', 'type': 'fcfs'},
-            {'name': 'Round Robin', 'type': 'rr'},
-            {'name': 'Shortest Job First', 'type': 'sjf'},
-            {'name': 'Priority (Non-Preemptive)', 'type': 'priority'},
-            {'name': 'Priority (Preemptive)', 'type': 'priority_p'}
-        ]
-        if 0 <= index < len(algorithms):
-            self.scheduler = algorithms[index]
-            self.current_algorithm_name = self.scheduler['name']
+        if 0 <= index < len(ALGORITHMS):
+            self.set_algorithm(ALGORITHMS[index])
     
     def apply_powerup_algorithm(self, algorithm_name):
         """Apply new scheduling algorithm from power-up for 3 seconds"""
-        algo_map = {
-            'SJF': {'name': 'Shortest Job First', 'type': 'sjf'},
-            'SRTF': {'name': 'Shortest Remaining Time First', 'type': 'sjf'},
-            'Round Robin': {'name': 'Round Robin', 'type': 'rr'},
-            'Priority (Non-Preemptive)': {'name': 'Priority (Non-Preemptive)', 'type': 'priority'},
-            'Priority (Preemptive)': {'name': 'Priority (Preemptive)', 'type': 'priority_p'}
-        }
-        
-        if algorithm_name in algo_map:
-            self.scheduler = algo_map[algorithm_name]
-            self.current_algorithm_name = self.scheduler['name']
-            self.powerup_algorithm_timer = self.powerup_algorithm_duration
+        if algorithm_name in POWERUP_ALGORITHMS:
             # Don't clear queues to maintain process continuity
+            self.set_algorithm(POWERUP_ALGORITHMS[algorithm_name])
+            self.powerup_algorithm_timer = self.powerup_algorithm_duration
     
     def reset(self):
-        self.ready_queue = []
+        self.ready_queue = make_policy(self.scheduler['type'], self.time_quantum)
         self.running_process = None
-        self.completed_processes = []
+        self.completed_processes = deque(maxlen=COMPLETED_HISTORY_SIZE)
+        self.completed_count = 0
+        self.entity_processes = {}
         self.current_time = 0
         self.current_quantum_time = 0
         self.context_switches = 0
+        self.dispatch_counts = {}
+        self.waiting_time_histogram = Histogram(SCHEDULING_TIME_BUCKETS)
+        self.turnaround_time_histogram = Histogram(SCHEDULING_TIME_BUCKETS)
         for algo in self.algorithm_metrics:
-            self.algorithm_metrics[algo] = {'total_time': 0, 'process_count': 0, 'waiting_times': [], 'turnaround_times': []}
+            self.algorithm_metrics[algo] = empty_algorithm_metrics()
+    
+    def clear_processes(self):
+        """Drop every queued and running process"""
+        self.ready_queue.clear()
+        self.running_process = None
+        self.current_quantum_time = 0
+        self.entity_processes = {}
+    
+    SNAPSHOT_FIELDS = ('current_algorithm_name', 'current_time', 'time_quantum', 'current_quantum_time',
+                       'context_switches', 'entity_time_slice', 'powerup_algorithm_timer',
+                       'powerup_algorithm_duration', 'next_queue_seq', 'front_queue_seq', 'completed_count')
+    
+    def snapshot(self, entity_index):
+        """Serialisable scheduler state; entity_index maps id(entity) to its slot in the game snapshot"""
+        def process_state(process):
+            state = dict(vars(process))
+            state.pop('queue_row', None)
+            state['entity'] = entity_index[id(process.entity)] if process.entity is not None else None
+            return state
+        
+        state = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        state.update({
+            'scheduler': dict(self.scheduler),
+            'base_algorithm': dict(self.base_algorithm),
+            'burst_distributions': {key: list(value) for key, value in self.burst_distributions.items()},
+            'ready_queue': [process_state(p) for p in self.ready_queue.order(len(self.ready_queue))],
+            'policy': self.ready_queue.snapshot(),
+            'running_process': process_state(self.running_process) if self.running_process else None,
+            'completed_processes': [process_state(p) for p in self.completed_processes],
+            'algorithm_metrics': copy.deepcopy(self.algorithm_metrics),
+            'dispatch_counts': dict(self.dispatch_counts),
+            'waiting_time_histogram': self.waiting_time_histogram.snapshot(),
+            'turnaround_time_histogram': self.turnaround_time_histogram.snapshot()
+        })
+        return state
+    
+    def restore(self, state, entities):
+        def process_from_state(process_state):
+            process = WebProcess.__new__(WebProcess)
+            process.__dict__.update(process_state)
+            process.entity = entities[process_state['entity']] if process_state['entity'] is not None else None
+            return process
+        
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, state[field])
+        self.scheduler = dict(state['scheduler'])
+        self.base_algorithm = dict(state['base_algorithm'])
+        self.burst_distributions = {key: tuple(value) for key, value in state['burst_distributions'].items()}
+        # Snapshots list the queue in dispatch order, so re-adding in order rebuilds it exactly
+        self.ready_queue = make_policy(self.scheduler['type'], self.time_quantum)
+        for process_state in state['ready_queue']:
+            self.ready_queue.add(process_from_state(process_state))
+        self.ready_queue.restore(state['policy'])
+        self.running_process = process_from_state(state['running_process']) if state['running_process'] else None
+        self.completed_processes = deque((process_from_state(p) for p in state['completed_processes']),
+                                         maxlen=COMPLETED_HISTORY_SIZE)
+        self.entity_processes = {id(p.entity): p for p in self.ready_queue if p.entity is not None}
+        if self.running_process and self.running_process.entity is not None:
+            self.entity_processes[id(self.running_process.entity)] = self.running_process
+        self.algorithm_metrics = copy.deepcopy(state['algorithm_metrics'])
+        self.dispatch_counts = dict(state['dispatch_counts'])
+        self.waiting_time_histogram.restore(state['waiting_time_histogram'])
+        self.turnaround_time_histogram.restore(state['turnaround_time_histogram'])
+    
+    def scheduling_order(self, limit):
+        """First `limit` ready processes in the order the current algorithm would dispatch them"""
+        return self.ready_queue.order(limit)
+    
+    def sample_burst(self, entity):
+        # Entity types without a distribution use the entity time slice for equal scheduling
+        low, high = self.burst_distributions.get(entity.entity_type, (self.entity_time_slice, self.entity_time_slice))
+        return max(MIN_BURST_TIME, low if low == high else self.rng.uniform(low, high))
+    
+    def enqueue(self, process, front=False):
+        if front:
+            self.front_queue_seq -= 1
+            process.queue_seq = self.front_queue_seq
+        else:
+            self.next_queue_seq += 1
+            process.queue_seq = self.next_queue_seq
+        self.ready_queue.add(process, front)
     
     def add_process(self, entity, task_type):
-        # Use entity time slice as burst time for equal scheduling
-        burst_time = self.entity_time_slice
-        pid = len(self.ready_queue) + len(self.completed_processes) + 1
+        burst_time = self.sample_burst(entity)
+        pid = len(self.ready_queue) + self.completed_count + 1
         process = WebProcess(pid, self.current_time, burst_time, entity.priority)
         process.entity = entity
         process.task_type = task_type
-        self.ready_queue.append(process)
+        self.enqueue(process)
+        self.entity_processes[id(entity)] = process
         return process
     
+    def _complete_running_process(self):
+        algo_name = self.scheduler['name']
+        completion_time = self.current_time
+        turnaround_time = completion_time - self.running_process.arrival_time
+        waiting_time = turnaround_time - self.running_process.burst_time
+        
+        self.running_process.completion_time = completion_time
+        self.running_process.turnaround_time = turnaround_time
+        self.running_process.waiting_time = max(0, waiting_time)
+        self.waiting_time_histogram.observe(max(0, waiting_time))
+        self.turnaround_time_histogram.observe(turnaround_time)
+        
+        if algo_name in self.algorithm_metrics:
+            self.algorithm_metrics[algo_name]['total_time'] += completion_time
+            self.algorithm_metrics[algo_name]['process_count'] += 1
+            self.algorithm_metrics[algo_name]['waiting_time_total'] += max(0, waiting_time)
+            self.algorithm_metrics[algo_name]['turnaround_time_total'] += turnaround_time
+        
+        process = self.running_process
+        if process.entity is not None:
+            self.entity_processes.pop(id(process.entity), None)
+        self.completed_processes.append(process)
+        self.completed_count += 1
+        self.running_process = None
+        self.current_quantum_time = 0
+        if self.on_complete is not None:
+            self.on_complete(process)
+    
+    def _dispatch(self):
+        old_process = self.running_process
+        self.running_process = self.ready_queue.pop()
+        
+        self.current_quantum_time = 0
+        if old_process != self.running_process:
+            self.context_switches += 1
+        algo_name = self.scheduler['name']
+        self.dispatch_counts[algo_name] = self.dispatch_counts.get(algo_name, 0) + 1
+    
     def update(self, dt):
-        self.current_time += dt
-        
-        # Handle powerup algorithm timer
-        if self.powerup_algorithm_timer > 0:
-            self.powerup_algorithm_timer -= dt
-            if self.powerup_algorithm_timer <= 0:
-                # Revert to FCFS
-                self.scheduler = self.base_algorithm.copy()
-                self.current_algorithm_name = self.scheduler['name']
-        
-        if not self.running_process and self.ready_queue:
-            old_process = self.running_process
+        """
+        Advance by dt, stopping exactly at every completion, quantum expiry and power-up
+        expiry inside the step, so one large step matches many small ones.
+        run_times records how long each entity held the CPU during the step.
+        """
+        self.run_times = {}
+        time_left = dt
+        
+        while True:
+            if self.running_process and self.ready_queue.should_preempt(self.running_process):
+                self.enqueue(self.running_process, front=True)
+                self.running_process = None
+                self.current_quantum_time = 0
             
-            if self.scheduler['type'] in ['priority', 'priority_p']:
-                next_process = min(self.ready_queue, key=lambda p: p.priority)
-                self.ready_queue.remove(next_process)
-                self.running_process = next_process
-            elif self.scheduler['type'] == 'sjf':
-                next_process = min(self.ready_queue, key=lambda p: p.remaining_time)
-                self.ready_queue.remove(next_process)
-                self.running_process = next_process
-            else:
-                self.running_process = self.ready_queue.pop(0)
+            if not self.running_process and self.ready_queue:
+                self._dispatch()
             
-            self.current_quantum_time = 0
-            if old_process != self.running_process:
-                self.context_switches += 1
+            if time_left <= STEP_EPSILON:
+                break
             
-        if self.running_process:
-            self.running_process.remaining_time -= dt
-            self.current_quantum_time += dt
+            # Run until the next event inside this step
+            step = time_left
+            if self.powerup_algorithm_timer > 0:
+                step = min(step, self.powerup_algorithm_timer)
+            quantum = None
+            if self.running_process:
+                step = min(step, max(0, self.running_process.remaining_time))
+                quantum = self.ready_queue.quantum(self.running_process)
+                if quantum is not None:
+                    step = min(step, max(0, quantum - self.current_quantum_time))
             
-            if self.running_process.remaining_time <= 0:
-                algo_name = self.scheduler['name']
-                completion_time = self.current_time
-                turnaround_time = completion_time - self.running_process.arrival_time
-                waiting_time = turnaround_time - self.running_process.burst_time
-                
-                self.running_process.completion_time = completion_time
-                self.running_process.turnaround_time = turnaround_time
-                self.running_process.waiting_time = max(0, waiting_time)
-                
-                if algo_name in self.algorithm_metrics:
-                    self.algorithm_metrics[algo_name]['total_time'] += completion_time
-                    self.algorithm_metrics[algo_name]['process_count'] += 1
-                    self.algorithm_metrics[algo_name]['waiting_times'].append(max(0, waiting_time))
-                    self.algorithm_metrics[algo_name]['turnaround_times'].append(turnaround_time)
-                
-                self.completed_processes.append(self.running_process)
-                self.running_process = None
-                self.current_quantum_time = 0
-                
-            elif self.scheduler['type'] == 'rr' and self.current_quantum_time >= self.time_quantum:
-                if self.running_process.remaining_time > 0:
-                    self.ready_queue.append(self.running_process)
-                self.running_process = None
-                self.current_quantum_time = 0
+            self.current_time += step
+            time_left -= step
+            self.ready_queue.tick(step, self.running_process)
+            
+            if self.running_process:
+                self.running_process.remaining_time -= step
+                self.current_quantum_time += step
+                entity = self.running_process.entity
+                if entity is not None:
+                    self.run_times[id(entity)] = self.run_times.get(id(entity), 0) + step
                 
-            elif self.scheduler['type'] == 'priority_p':
-                if self.ready_queue:
-                    highest_priority = min(p.priority for p in self.ready_queue)
-                    if highest_priority < self.running_process.priority:
-                        self.ready_queue.insert(0, self.running_process)
-                        self.running_process = None
-                        self.current_quantum_time = 0
+                if self.running_process.remaining_time <= STEP_EPSILON:
+                    self._complete_running_process()
+                elif quantum is not None and self.current_quantum_time >= quantum - STEP_EPSILON:
+                    self.ready_queue.on_quantum_expired(self.running_process)
+                    self.enqueue(self.running_process)
+                    self.running_process = None
+                    self.current_quantum_time = 0
+            
+            # Handle powerup algorithm timer
+            if self.powerup_algorithm_timer > 0:
+                self.powerup_algorithm_timer -= step
+                if self.powerup_algorithm_timer <= STEP_EPSILON:
+                    self.powerup_algorithm_timer = 0
+                    # Revert to FCFS
+                    self.set_algorithm(self.base_algorithm)
 
 class WebLineCrossingGame:
-    def __init__(self, difficulty='easy'):
-        self.scheduler = WebScheduler(difficulty)
-        self.finish_line_x = 700
-        self.start_line_x = 100
-        self.game_width = 800
-        self.game_height = 400
+    def __init__(self, difficulty='easy', seed=None, config=None, high_scores=None):
+        self.config = config or level_config(difficulty)
+        self.rng = random.Random(seed)
+        self.difficulty = difficulty
         self.process_speed = 1.0
+        self.level_start_time = 0
+        self.attempts = 0
+        self.high_scores = high_scores if high_scores is not None else self.load_high_scores()
+        self.build_level()
+    
+    def build_level(self):
+        """Create the scheduler and every entity for a fresh round of this level"""
+        self.scheduler = WebScheduler(self.difficulty, self.config.burst_distributions(), self.rng)
+        self.scheduler.on_complete = self._requeue_entity
+        self.game_width = self.config.arena_width
+        self.game_height = self.config.arena_height
+        self.finish_line_x = self.game_width - 100
+        self.start_line_x = 100
         
-        self.difficulty = difficulty
         self.boss_enemies = []
         self.boss_items = []
         self.boss_items_collected = 0
-        self.level_start_time = 0
-        self.high_scores = self.load_high_scores()
         
-        self.player = WebEntity(self.start_line_x, 200, 'player', priority=1)
+        self.player = WebEntity(self.start_line_x, self.game_height // 2, 'player', priority=1)
         
         self.enemies = []
         self.create_difficulty_enemies()
         
-        # Create 5 power-ups with random algorithm assignment (excluding FCFS as it's the starting algorithm)
-        self.powerups = []
-        algorithms = ['SJF', 'SRTF', 'Round Robin', 'Priority (Non-Preemptive)', 'Priority (Preemptive)']
-        random.shuffle(algorithms)
+        # Create power-ups; algorithms and positions are rolled in randomise_layout
+        self.powerups = [WebEntity(0, 0, 'powerup', priority=0) for _ in range(self.config.powerup_count)]
         
-        for i in range(5):
-            powerup = WebEntity(
-                random.randint(150 + i * 80, 200 + i * 80),
-                random.randint(80 + (i % 2) * 150, 120 + (i % 2) * 150),
-                'powerup',
-                priority=0
-            )
-            powerup.algorithm = algorithms[i]
-            self.powerups.append(powerup)
-        
-        # Create 3 keys to collect
-        self.keys = []
-        key_positions = [(250, 150), (450, 250), (550, 120)]
-        for i in range(3):
-            key = WebEntity(
-                key_positions[i][0] + random.randint(-30, 30),
-                key_positions[i][1] + random.randint(-30, 30),
-                'key',
-                priority=0
-            )
-            self.keys.append(key)
+        # Create keys to collect
+        self.keys = [WebEntity(0, 0, 'key', priority=0) for _ in range(self.config.key_count)]
         
-        # Create 3 locks at the finish line
+        # Create locks at the finish line, wrapping into extra columns on tall lock counts
         self.locks = []
-        for i in range(3):
+        lock_span = max(60, self.game_height - 200)
+        for i in range(self.config.lock_count):
             lock = WebEntity(
-                self.finish_line_x - 20,
-                120 + i * 60,
+                self.finish_line_x - 20 - (i * 60 // lock_span) * 30,
+                120 + (i * 60) % lock_span,
                 'lock',
                 priority=0
             )
             self.locks.append(lock)
         
+        self.randomise_layout()
+        
         self.powerups_collected = 0
         self.keys_collected = 0
         self.current_powerup_popup = None
@@ -254,7 +495,6 @@ class WebLineCrossingGame:
         self.entities = [self.player] + self.enemies + self.powerups + self.keys + self.locks + self.boss_items
         self.game_won = False
         self.game_time = 0
-        self.attempts = 0
         self.lives = 3
         self.game_over = False
         self.show_game_over = False
@@ -265,46 +505,74 @@ class WebLineCrossingGame:
         self.boss_enemies = []
         self.boss_items = []
         
-        if self.difficulty == 'easy':
-            enemy_count = 7
-        elif self.difficulty == 'normal':
-            enemy_count = 12
-        elif self.difficulty == 'hard':
-            enemy_count = 7
-            self.create_boss(1)
-        elif self.difficulty == 'super_hard':
-            enemy_count = 7
-            self.create_boss(2)
+        enemy_count = self.config.enemy_count
+        if self.config.boss_count:
+            self.create_boss(self.config.boss_count)
         
         # Create regular enemies
         for i in range(enemy_count):
             x_pos = self.start_line_x + 50 + i * ((self.finish_line_x - self.start_line_x - 100) // max(1, enemy_count))
-            y_pos = 80 if i % 2 == 0 else 320
+            y_pos = 80 if i % 2 == 0 else self.game_height - 80
             enemy = WebEntity(x_pos, y_pos, 'enemy', priority=3)
             enemy.direction = 1 if i % 2 == 0 else -1
-            enemy.speed = random.uniform(2, 4)
             self.enemies.append(enemy)
     
     def create_boss(self, boss_count):
         boss_colors = ['red', 'blue']
         for i in range(boss_count):
-            boss_x = random.randint(self.start_line_x + 100, self.finish_line_x - 100)
-            boss_y = 150 + i * 100
-            boss = WebEntity(boss_x, boss_y, 'boss', priority=2)
+            boss = WebEntity(0, 150 + (i * 100) % max(100, self.game_height - 250), 'boss', priority=2)
             boss.direction = 1
             boss.speed = 2.0
             boss.size = 40
-            boss.color_type = boss_colors[i]
+            boss.color_type = boss_colors[i % len(boss_colors)]
             self.boss_enemies.append(boss)
             self.enemies.append(boss)
             
             # Create individual sword for each boss
-            item_x = random.randint(self.start_line_x + 50, self.finish_line_x - 50)
-            item_y = random.randint(100, 300)
-            boss_item = WebEntity(item_x, item_y, 'boss_item', priority=0)
-            boss_item.color_type = boss_colors[i]
+            boss_item = WebEntity(0, 0, 'boss_item', priority=0)
+            boss_item.color_type = boss_colors[i % len(boss_colors)]
             self.boss_items.append(boss_item)
     
+    def randomise_layout(self):
+        """Roll power-up algorithms, pickup and boss positions and enemy speeds"""
+        # Random algorithm assignment (excluding FCFS as it's the starting algorithm)
+        algorithms = list(POWERUP_ALGORITHMS)
+        self.rng.shuffle(algorithms)
+        # Spread power-ups across the track in alternating rows
+        stride = min(80, (self.finish_line_x - 200) // max(1, len(self.powerups)))
+        rows = max(2, (self.game_height - 160) // 150)
+        for i, powerup in enumerate(self.powerups):
+            place_entity(powerup,
+                         self.rng.randint(150 + i * stride, 200 + i * stride),
+                         self.rng.randint(80 + (i % rows) * 150, 120 + (i % rows) * 150))
+            powerup.algorithm = algorithms[i % len(algorithms)]
+        
+        # Base key positions are laid out for an 800x400 arena; extra keys go anywhere on the track
+        key_positions = [(250, 150), (450, 250), (550, 120)]
+        scale_x = self.game_width / 800
+        scale_y = self.game_height / 400
+        for i, key in enumerate(self.keys):
+            if i < len(key_positions):
+                place_entity(key,
+                             int(key_positions[i][0] * scale_x) + self.rng.randint(-30, 30),
+                             int(key_positions[i][1] * scale_y) + self.rng.randint(-30, 30))
+            else:
+                place_entity(key,
+                             self.rng.randint(self.start_line_x + 100, self.finish_line_x - 100),
+                             self.rng.randint(80, self.game_height - 80))
+        
+        for enemy in self.enemies:
+            if enemy.entity_type == 'enemy':
+                enemy.speed = self.rng.uniform(2, 4)
+        
+        for boss in self.boss_enemies:
+            place_entity(boss, self.rng.randint(self.start_line_x + 100, self.finish_line_x - 100), boss.y)
+        
+        for boss_item in self.boss_items:
+            place_entity(boss_item,
+                         self.rng.randint(self.start_line_x + 50, self.finish_line_x - 50),
+                         self.rng.randint(100, self.game_height - 100))
+    
     def load_high_scores(self):
         try:
             with open('high_scores.json', 'r') as f:
@@ -329,120 +597,158 @@ class WebLineCrossingGame:
         return False
     
     def set_process_speed(self, speed):
-        self.process_speed = speed
+        self.process_speed = max(0.1, min(MAX_PROCESS_SPEED, float(speed)))
     
     def reset_positions(self):
         self.player.x = self.start_line_x
-        self.player.y = 200
+        self.player.y = self.game_height // 2
         
         for i, enemy in enumerate(self.enemies):
             # Keep enemies within start and finish line bounds
             enemy.x = self.start_line_x + 50 + i * ((self.finish_line_x - self.start_line_x - 100) // max(1, len(self.enemies)))
-            enemy.y = 80 if i % 2 == 0 else 320
+            enemy.y = 80 if i % 2 == 0 else self.game_height - 80
             enemy.direction = 1 if i % 2 == 0 else -1
     
     def reset_game(self):
-        self.game_won = False
-        self.game_over = False
-        self.game_time = 0
+        # Rebuilding the level also drops collected swords and boss items from the last round
+        self.build_level()
         self.level_start_time = time.time()
-        self.lives = 3
-        
-        self.reset_positions()
-        
-        # Respawn powerups with new random algorithms
-        self.powerups = []
-        algorithms = ['SJF', 'SRTF', 'Round Robin', 'Priority (Non-Preemptive)', 'Priority (Preemptive)']
-        random.shuffle(algorithms)
+    
+    SNAPSHOT_FIELDS = ('difficulty', 'finish_line_x', 'start_line_x', 'game_width', 'game_height',
+                       'process_speed', 'boss_items_collected', 'level_start_time', 'powerups_collected',
+                       'keys_collected', 'current_powerup_popup', 'popup_timer', 'game_won', 'game_time',
+                       'attempts', 'lives', 'game_over', 'show_game_over', 'game_over_timer')
+    SNAPSHOT_GROUPS = ('enemies', 'boss_enemies', 'powerups', 'keys', 'locks', 'boss_items', 'entities')
+    
+    def snapshot(self):
+        """
+        Compact, JSON-serialisable copy of the game: entities, scheduler queues,
+        running process, the last completed processes, RNG state and timers.
+        High scores are not included.
+        """
+        entities = []
+        entity_index = {}
         
-        for i in range(5):
-            powerup = WebEntity(
-                random.randint(150 + i * 80, 200 + i * 80),
-                random.randint(80 + (i % 2) * 150, 120 + (i % 2) * 150),
-                'powerup',
-                priority=0
-            )
-            powerup.algorithm = algorithms[i]
-            self.powerups.append(powerup)
+        def index_of(entity):
+            # WebEntity compares by value, so identity is tracked by id()
+            if id(entity) not in entity_index:
+                entity_index[id(entity)] = len(entities)
+                entities.append(entity_to_state(entity))
+            return entity_index[id(entity)]
         
-        # Respawn keys
-        self.keys = []
-        key_positions = [(250, 150), (450, 250), (550, 120)]
-        for i in range(3):
-            key = WebEntity(
-                key_positions[i][0] + random.randint(-30, 30),
-                key_positions[i][1] + random.randint(-30, 30),
-                'key',
-                priority=0
-            )
-            self.keys.append(key)
+        state = {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+        state['config'] = asdict(self.config)
+        state['player'] = index_of(self.player)
+        for group in self.SNAPSHOT_GROUPS:
+            state[group] = [index_of(entity) for entity in getattr(self, group)]
         
-        # Respawn locks at finish line
-        self.locks = []
-        for i in range(3):
-            lock = WebEntity(
-                self.finish_line_x - 20,
-                120 + i * 60,
-                'lock',
-                priority=0
-            )
-            self.locks.append(lock)
+        # Processes may still point at entities no longer in any group (e.g. defeated bosses)
+        scheduler = self.scheduler
+        for process in list(scheduler.ready_queue) + list(scheduler.completed_processes) + [scheduler.running_process]:
+            if process is not None and process.entity is not None:
+                index_of(process.entity)
+        state['scheduler'] = scheduler.snapshot(entity_index)
+        state['entity_states'] = entities
         
-        self.powerups_collected = 0
-        self.keys_collected = 0
-        self.current_powerup_popup = None
-        self.popup_timer = 0
-        self.scheduler = WebScheduler(self.difficulty)
+        version, internal_state, gauss_next = self.rng.getstate()
+        state['rng'] = [version, list(internal_state), gauss_next]
+        return state
+    
+    def restore(self, state):
+        """Load a snapshot into this game in place"""
+        entities = [entity_from_state(entity_state) for entity_state in state['entity_states']]
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, state[field])
+        self.config = LevelConfig.from_dict(state['config'])
+        self.player = entities[state['player']]
+        for group in self.SNAPSHOT_GROUPS:
+            setattr(self, group, [entities[i] for i in state[group]])
+        self.scheduler.restore(state['scheduler'], entities)
         
-        self.create_difficulty_enemies()
-        self.entities = [self.player] + self.enemies + self.powerups + self.keys + self.locks + self.boss_items
-        self.scheduler.reset()
+        version, internal_state, gauss_next = state['rng']
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+    
+    @classmethod
+    def from_snapshot(cls, state, high_scores=None):
+        """Build a game from a snapshot, e.g. one taken in another worker process"""
+        game = cls.__new__(cls)
+        game.rng = random.Random()
+        game.scheduler = WebScheduler(state['difficulty'], rng=game.rng)
+        game.scheduler.on_complete = game._requeue_entity
+        game.high_scores = high_scores if high_scores is not None else game.load_high_scores()
+        game.restore(state)
+        return game
     
     def move_player(self, dx, dy):
         # Only allow movement if player's process is currently running
-        if self.scheduler.running_process and self.scheduler.running_process.entity == self.player:
+        if self.scheduler.can_entity_execute(self.player):
             self.player.x += dx * self.player.speed * 5
             self.player.y += dy * self.player.speed * 5
-            self.player.x = max(50, min(750, self.player.x))
-            self.player.y = max(50, min(350, self.player.y))
+            self.player.x = max(50, min(self.game_width - 50, self.player.x))
+            self.player.y = max(50, min(self.game_height - 50, self.player.y))
         
         # Add player process if not already in queue
-        player_has_process = any(p.entity == self.player for p in self.scheduler.ready_queue) or \
-                           (self.scheduler.running_process and self.scheduler.running_process.entity == self.player)
-        
-        if not player_has_process:
+        if not self.scheduler.has_process(self.player):
             self.scheduler.add_process(self.player, 'movement')
     
     def update(self, dt):
-        if self.game_won:
+        """
+        Advance one emitted frame of dt seconds. process_speed scales simulated time; the
+        scaled time is split into at most MAX_SUBSTEPS engine steps, and the scheduler steps
+        exactly between events, so cost per frame does not grow with the speed factor.
+        Process arrivals and completions do not depend on the speed; movement and
+        collisions are resolved once per engine step.
+        """
+        sim_dt = dt * self.process_speed
+        substeps = max(1, min(MAX_SUBSTEPS, math.ceil(self.process_speed - STEP_EPSILON)))
+        for _ in range(substeps):
+            if self.game_won:
+                return
+            self._step(sim_dt / substeps, dt / substeps)
+    
+    def _requeue_entity(self, process):
+        # The player and live enemies always want the CPU again; queue them at the completion time
+        entity = process.entity
+        if entity is None or self.scheduler.has_process(entity):
             return
-            
+        if entity is self.player:
+            self.scheduler.add_process(entity, 'movement')
+        elif entity.entity_type == 'enemy' or any(boss is entity for boss in self.boss_enemies):
+            self.scheduler.add_process(entity, 'ai_movement')
+    
+    def _move_enemy(self, enemy, run_time):
+        enemy.y += enemy.direction * enemy.speed * run_time * 30
+        
+        # Bounce at top and bottom, reflecting any overshoot from long steps
+        top, bottom = 50, self.game_height - 50
+        while enemy.y < top or enemy.y > bottom:
+            if enemy.y < top:
+                enemy.y = 2 * top - enemy.y
+                enemy.direction = 1
+            else:
+                enemy.y = 2 * bottom - enemy.y
+                enemy.direction = -1
+    
+    def _step(self, dt, frame_dt):
+        # dt is simulated time; on-screen timers (popups, game over) use frame_dt
         self.game_time += dt
         self.scheduler.update(dt)
         current_time = time.time()
         
-        # Add processes for all entities that don't have one
+        # Completed processes are re-queued inside the scheduler step; this covers new
+        # entities and the player-first restart after a collision
         all_entities = [self.player] + self.enemies
         for entity in all_entities:
-            entity_has_process = any(p.entity == entity for p in self.scheduler.ready_queue) or \
-                               (self.scheduler.running_process and self.scheduler.running_process.entity == entity)
-            
-            if not entity_has_process:
-                task_type = 'movement' if entity == self.player else 'ai_movement'
+            if not self.scheduler.has_process(entity):
+                task_type = 'movement' if entity is self.player else 'ai_movement'
                 self.scheduler.add_process(entity, task_type)
         
-        # Move enemies only when their process is running
+        # Move enemies only for the time their process held the CPU
+        run_times = self.scheduler.run_times
         for enemy in self.enemies:
-            if self.scheduler.can_entity_execute(enemy):
-                enemy.y += enemy.direction * enemy.speed * dt * 30
-                
-                # Bounce at top and bottom
-                if enemy.y <= 50:
-                    enemy.y = 50
-                    enemy.direction = 1
-                elif enemy.y >= 350:
-                    enemy.y = 350
-                    enemy.direction = -1
+            run_time = run_times.get(id(enemy))
+            if run_time:
+                self._move_enemy(enemy, run_time)
         
         for entity in self.entities:
             can_execute = self.scheduler.can_entity_execute(entity)
@@ -453,7 +759,7 @@ class WebLineCrossingGame:
         
         # Handle game over timer
         if self.show_game_over:
-            self.game_over_timer -= dt
+            self.game_over_timer -= frame_dt
             if self.game_over_timer <= 0:
                 self.show_game_over = False
                 self.lives = 3
@@ -471,8 +777,7 @@ class WebLineCrossingGame:
                 else:
                     self.reset_positions()
                     # Give player first move priority
-                    self.scheduler.ready_queue.clear()
-                    self.scheduler.running_process = None
+                    self.scheduler.clear_processes()
                     self.scheduler.add_process(self.player, 'movement')
                 return
         
@@ -523,7 +828,7 @@ class WebLineCrossingGame:
         
         # Handle popup timer
         if self.popup_timer > 0:
-            self.popup_timer -= dt
+            self.popup_timer -= frame_dt
             if self.popup_timer <= 0:
                 self.current_powerup_popup = None
                 
@@ -548,37 +853,51 @@ class WebLineCrossingGame:
             # Block player if conditions not met
             self.player.x = self.finish_line_x - 5
     
-    def _get_process_queue_display(self):
-        processes = []
-        
-        if self.scheduler.running_process:
-            p = self.scheduler.running_process
-            processes.append({
-                'pid': p.pid,
-                'priority': p.priority,
-                'remaining_time': p.remaining_time,
-                'burst_time': p.burst_time,
-                'entity_type': p.entity.entity_type if p.entity else 'system',
-                'task_type': p.task_type,
-                'status': 'RUNNING'
-            })
-        
-        for p in self.scheduler.ready_queue:
-            processes.append({
-                'pid': p.pid,
-                'priority': p.priority,
-                'remaining_time': p.remaining_time,
-                'burst_time': p.burst_time,
-                'entity_type': p.entity.entity_type if p.entity else 'system',
-                'task_type': p.task_type,
-                'status': 'WAITING'
-            })
-            
-        return processes
+    def _new_queue_row(self, process, status):
+        return {
+            'pid': process.pid,
+            'burst_time': process.burst_time,
+            'entity_type': process.entity.entity_type if process.entity else 'system',
+            'task_type': process.task_type,
+            'priority': process.priority,
+            'remaining_time': process.remaining_time,
+            'status': status
+        }
     
-
+    def _queue_row(self, process, status):
+        # Rows sent every frame are cached on the process and refreshed in place by the game loop
+        row = getattr(process, 'queue_row', None)
+        if row is None:
+            row = process.queue_row = self._new_queue_row(process, status)
+            return row
+        row['priority'] = process.priority
+        row['remaining_time'] = process.remaining_time
+        row['status'] = status
+        return row
     
-
+    def _queued_processes(self, count, make_row):
+        running = self.scheduler.running_process
+        processes = [running] if running else []
+        processes += self.scheduler.scheduling_order(count - len(processes))
+        return [make_row(p, 'RUNNING' if p is running else 'WAITING') for p in processes[:count]]
+    
+    def _get_process_queue_display(self):
+        return self._queued_processes(QUEUE_PREVIEW_SIZE, self._queue_row)
+    
+    def get_queue_page(self, page=0, page_size=QUEUE_PAGE_SIZE):
+        """
+        One page of the full queue: running process first, then ready processes in scheduling order.
+        Pages are built from fresh rows so they never share dicts with a frame being sent.
+        """
+        page = max(0, page)
+        page_size = max(1, min(page_size, MAX_QUEUE_PAGE_SIZE))
+        start = page * page_size
+        return {
+            'page': page,
+            'page_size': page_size,
+            'total': len(self.scheduler.ready_queue) + (1 if self.scheduler.running_process else 0),
+            'entries': self._queued_processes(start + page_size, self._new_queue_row)[start:]
+        }
     
     def get_state(self):
         return {
@@ -621,7 +940,8 @@ class WebLineCrossingGame:
             'scheduler': {
                 'name': self.scheduler.scheduler['name'],
                 'active_processes': len(self.scheduler.ready_queue) + (1 if self.scheduler.running_process else 0),
-                'completed_processes': len(self.scheduler.completed_processes),
+                'queue_length': len(self.scheduler.ready_queue),
+                'completed_processes': self.scheduler.completed_count,
                 'context_switches': getattr(self.scheduler, 'context_switches', 0),
                 'metrics': self.scheduler.algorithm_metrics,
                 'powerup_timer': getattr(self.scheduler, 'powerup_algorithm_timer', 0),
@@ -642,6 +962,9 @@ class WebLineCrossingGame:
                 'current_powerup_popup': self.current_powerup_popup,
                 'popup_timer': self.popup_timer,
                 'difficulty': self.difficulty,
+                'width': self.game_width,
+                'height': self.game_height,
+                'keys_total': self.config.key_count,
                 'boss_items_collected': self.boss_items_collected,
                 'bosses_remaining': len(self.boss_enemies),
                 'high_scores': self.high_scores,
@@ -656,8 +979,8 @@ class WebLineCrossingGame:
         
         for algo_name, metrics in self.scheduler.algorithm_metrics.items():
             if metrics['process_count'] > 0:
-                avg_waiting_time = sum(metrics['waiting_times']) / len(metrics['waiting_times'])
-                avg_turnaround = sum(metrics['turnaround_times']) / len(metrics['turnaround_times'])
+                avg_waiting_time = metrics['waiting_time_total'] / metrics['process_count']
+                avg_turnaround = metrics['turnaround_time_total'] / metrics['process_count']
                 avg_completion_time = metrics['total_time'] / metrics['process_count']
                 throughput = metrics['process_count'] / max(1, self.game_time)
                 
@@ -682,7 +1005,7 @@ class WebLineCrossingGame:
     def _get_process_table_data(self):
         table_data = []
         
-        for p in self.scheduler.completed_processes[-10:]:
+        for p in self.scheduler.completed_processes:
             table_data.append({
                 'pid': p.pid,
                 'entity_type': p.entity.entity_type if p.entity else 'system',
@@ -695,4 +1018,9 @@ class WebLineCrossingGame:
                 'waiting_time': round(getattr(p, 'waiting_time', 0), 2)
             })
         
-        return table_data
\ No newline at end of file
+        return table_data
+
+
+def new_game(difficulty='easy', high_scores=None, config=None):
+    """Fresh game that keeps the caller's high scores instead of re-reading high_scores.json"""
+    return WebLineCrossingGame(difficulty, config=config, high_scores=high_scores)
@@ -0,0 +1,235 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# The game loop targets 30 ticks per second
+TARGET_TICK_INTERVAL = 1 / 30
+
+# Bucket bounds in seconds
+TICK_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.0333, 0.05, 0.1, 0.25)
+TICK_INTERVAL_BUCKETS = (0.03, 0.0333, 0.035, 0.04, 0.05, 0.0667, 0.1, 0.25, 1.0)
+SCHEDULING_TIME_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 40.0, 80.0)
+# Measured tick rates kept for the request_metrics FPS chart (one per rate window)
+RATE_HISTORY_SIZE = 60
+
+
+class Histogram:
+    """Cumulative-on-render histogram with fixed upper bounds"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+    def restore(self, state):
+        self.counts = list(state['counts'])
+        self.sum = state['sum']
+        self.count = state['count']
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield _format_value(bound), cumulative
+        yield '+Inf', self.count
+
+
+class RateMeter:
+    """Turns a monotonically increasing total into a per-second rate"""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.total = 0
+        self.rate = 0.0
+        self._window_total = 0
+        self._window_start = None
+
+    def add(self, amount=1):
+        self.total += amount
+
+    def tick(self, now):
+        """Close the current window if it is due; returns True when a new rate was measured"""
+        if self._window_start is None:
+            self._window_start = now
+            self._window_total = self.total
+            return False
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.rate = (self.total - self._window_total) / elapsed
+            self._window_start = now
+            self._window_total = self.total
+            return True
+        return False
+
+    def current_rate(self, now):
+        """Rate as seen at `now`: decays towards zero once tick() stops being called"""
+        if self._window_start is None:
+            return 0.0
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            return (self.total - self._window_total) / elapsed
+        return self.rate
+
+
+class CountingJSON:
+    """json module stand-in for Socket.IO that counts serialised bytes"""
+
+    def __init__(self, meter):
+        self.meter = meter
+
+    def dumps(self, *args, **kwargs):
+        encoded = json.dumps(*args, **kwargs)
+        self.meter.add(len(encoded))
+        return encoded
+
+    def loads(self, *args, **kwargs):
+        return json.loads(*args, **kwargs)
+
+
+class ServerTelemetry:
+    """Pre-aggregated server counters, updated by the tick loop and read by /metrics"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active_sessions = 0
+        self.ticks = RateMeter()
+        self.bytes_emitted = RateMeter()
+        self.tick_latency = Histogram(TICK_LATENCY_BUCKETS)
+        self.tick_interval = Histogram(TICK_INTERVAL_BUCKETS)
+        self.tick_overruns = 0
+        self.last_tick = None
+        self.rate_history = deque(maxlen=RATE_HISTORY_SIZE)
+
+    def session_opened(self):
+        with self.lock:
+            self.active_sessions += 1
+
+    def session_closed(self):
+        with self.lock:
+            self.active_sessions = max(0, self.active_sessions - 1)
+
+    def record_tick(self, latency, now, deadline):
+        """
+        latency is the work done in the tick, now a monotonic timestamp taken at its end and
+        deadline the point on the loop's 30 Hz schedule by which the tick had to finish
+        """
+        self.ticks.add()
+        self.tick_latency.observe(latency)
+        if now > deadline or latency > TARGET_TICK_INTERVAL:
+            self.tick_overruns += 1
+        if self.last_tick is not None:
+            self.tick_interval.observe(now - self.last_tick)
+        self.last_tick = now
+        if self.ticks.tick(now):
+            with self.lock:
+                self.rate_history.append(self.ticks.rate)
+        self.bytes_emitted.tick(now)
+
+    def loop_idle(self):
+        """The loop is paused or stopped; the gap before the next tick is not an interval"""
+        self.last_tick = None
+
+    def fps_history(self):
+        with self.lock:
+            return list(self.rate_history)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsWriter:
+    """Builds a Prometheus text exposition (format 0.0.4)"""
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self.lines = []
+
+    def _header(self, name, kind, help_text):
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {kind}')
+
+    def scalar(self, name, kind, help_text, value):
+        self._header(name, kind, help_text)
+        self.lines.append(f'{name} {_format_value(value)}')
+
+    def labelled(self, name, kind, help_text, label, values):
+        self._header(name, kind, help_text)
+        for key, value in values.items():
+            self.lines.append(f'{name}{{{label}="{_escape_label(key)}"}} {_format_value(value)}')
+
+    def histogram(self, name, help_text, histogram):
+        self._header(name, 'histogram', help_text)
+        for bound, count in histogram.samples():
+            self.lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+        self.lines.append(f'{name}_sum {_format_value(histogram.sum)}')
+        self.lines.append(f'{name}_count {histogram.count}')
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def render_metrics(telemetry, scheduler, stream_stats=None, now=None):
+    """Render server and scheduler telemetry without touching game entities"""
+    stream_stats = stream_stats or {}
+    now = time.monotonic() if now is None else now
+    writer = MetricsWriter()
+    writer.scalar('gamesched_active_sessions', 'gauge',
+                  'Connected Socket.IO clients', telemetry.active_sessions)
+    writer.scalar('gamesched_ticks_total', 'counter',
+                  'Game loop ticks executed', telemetry.ticks.total)
+    writer.scalar('gamesched_tick_rate', 'gauge',
+                  'Game loop ticks per second over the last window', telemetry.ticks.current_rate(now))
+    writer.histogram('gamesched_tick_latency_seconds',
+                     'Time spent updating and emitting one tick', telemetry.tick_latency)
+    writer.histogram('gamesched_tick_interval_seconds',
+                     'Time between consecutive game loop ticks', telemetry.tick_interval)
+    writer.scalar('gamesched_tick_overruns_total', 'counter',
+                  'Ticks that missed their 30 Hz deadline or took longer than one interval',
+                  telemetry.tick_overruns)
+    writer.scalar('gamesched_emitted_bytes_total', 'counter',
+                  'Bytes of Socket.IO payload serialised', telemetry.bytes_emitted.total)
+    writer.scalar('gamesched_emitted_bytes_per_second', 'gauge',
+                  'Socket.IO payload bytes per second over the last window',
+                  telemetry.bytes_emitted.current_rate(now))
+    writer.labelled('gamesched_client_update_rate', 'gauge',
+                    'Current game_update rate per client in Hz', 'client',
+                    {sid: stats['update_rate'] for sid, stats in stream_stats.items()})
+    writer.labelled('gamesched_client_frames_sent_total', 'counter',
+                    'Frames sent to each client', 'client',
+                    {sid: stats['frames_sent'] for sid, stats in stream_stats.items()})
+    writer.labelled('gamesched_client_frames_conflated_total', 'counter',
+                    'Frames replaced by a newer frame before reaching each client', 'client',
+                    {sid: stats['frames_conflated'] for sid, stats in stream_stats.items()})
+    writer.labelled('gamesched_scheduler_dispatches_total', 'counter',
+                    'Processes dispatched to the CPU per algorithm', 'algorithm',
+                    dict(scheduler.dispatch_counts))
+    writer.scalar('gamesched_scheduler_context_switches_total', 'counter',
+                  'Scheduler context switches', scheduler.context_switches)
+    writer.scalar('gamesched_scheduler_ready_queue_depth', 'gauge',
+                  'Processes waiting in the ready queue', len(scheduler.ready_queue))
+    writer.histogram('gamesched_scheduler_waiting_time_seconds',
+                     'Waiting time of completed processes', scheduler.waiting_time_histogram)
+    writer.histogram('gamesched_scheduler_turnaround_time_seconds',
+                     'Turnaround time of completed processes', scheduler.turnaround_time_histogram)
+    return writer.render()
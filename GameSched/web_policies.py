@@ -0,0 +1,238 @@
+import heapq
+from collections import deque
+from itertools import chain, islice
+
+
+class SchedulingPolicy:
+    """
+    Owns the ready queue for one scheduling algorithm.
+    WebScheduler assigns every queued process a `queue_seq` (lower runs first among equals)
+    and drives the policy; each policy keeps whatever structure makes dispatch cheap.
+    """
+
+    def add(self, process, front=False):
+        raise NotImplementedError
+
+    def pop(self):
+        raise NotImplementedError
+
+    def order(self, limit):
+        """First `limit` processes in dispatch order"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def quantum(self, process):
+        """Time slice for the running process, or None to run until completion"""
+        return None
+
+    def should_preempt(self, running):
+        return False
+
+    def on_quantum_expired(self, process):
+        pass
+
+    def tick(self, dt, running):
+        pass
+
+    def snapshot(self):
+        return {}
+
+    def restore(self, state):
+        pass
+
+
+class FCFSPolicy(SchedulingPolicy):
+    def __init__(self):
+        self.queue = deque()
+
+    def add(self, process, front=False):
+        if front:
+            self.queue.appendleft(process)
+        else:
+            self.queue.append(process)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def order(self, limit):
+        return list(islice(self.queue, max(0, limit)))
+
+    def clear(self):
+        self.queue.clear()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+class RoundRobinPolicy(FCFSPolicy):
+    def __init__(self, time_quantum=2.0):
+        super().__init__()
+        self.time_quantum = time_quantum
+
+    def quantum(self, process):
+        return self.time_quantum
+
+
+class KeyedHeapPolicy(SchedulingPolicy):
+    """Min-heap on (key, queue_seq); subclasses pick the key and whether it preempts"""
+
+    preemptive = False
+
+    def __init__(self):
+        self.heap = []
+
+    def key(self, process):
+        raise NotImplementedError
+
+    def add(self, process, front=False):
+        heapq.heappush(self.heap, (self.key(process), process.queue_seq, process))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def order(self, limit):
+        return [entry[2] for entry in heapq.nsmallest(max(0, limit), self.heap)]
+
+    def clear(self):
+        self.heap.clear()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in self.heap)
+
+    def should_preempt(self, running):
+        return self.preemptive and bool(self.heap) and self.heap[0][0] < self.key(running)
+
+
+class SJFPolicy(KeyedHeapPolicy):
+    def key(self, process):
+        return process.remaining_time
+
+
+class SRTFPolicy(SJFPolicy):
+    # Waiting processes do not age, so only the running process' key moves
+    preemptive = True
+
+
+class PriorityPolicy(KeyedHeapPolicy):
+    def key(self, process):
+        return process.priority
+
+
+class PreemptivePriorityPolicy(PriorityPolicy):
+    preemptive = True
+
+
+class MLFQPolicy(SchedulingPolicy):
+    """
+    Multilevel feedback queue: new processes start at level 0, a process that uses up its
+    quantum drops a level (quanta double per level), and every boost_interval seconds all
+    processes return to level 0 so long-running ones cannot starve. A process running at
+    boost time finishes its current slice at its old level and re-enters at level 0.
+    """
+
+    def __init__(self, levels=3, base_quantum=0.5, boost_interval=5.0):
+        self.queues = [deque() for _ in range(levels)]
+        self.base_quantum = base_quantum
+        self.boost_interval = boost_interval
+        self.boost_timer = 0.0
+
+    def _level(self, process):
+        if not hasattr(process, 'mlfq_level'):
+            process.mlfq_level = 0
+        return min(process.mlfq_level, len(self.queues) - 1)
+
+    def add(self, process, front=False):
+        if getattr(process, 'mlfq_boosted', False):
+            process.mlfq_level = 0
+            process.mlfq_boosted = False
+        queue = self.queues[self._level(process)]
+        if front:
+            queue.appendleft(process)
+        else:
+            queue.append(process)
+
+    def pop(self):
+        for queue in self.queues:
+            if queue:
+                return queue.popleft()
+        raise IndexError('pop from empty MLFQ')
+
+    def order(self, limit):
+        return list(islice(chain.from_iterable(self.queues), max(0, limit)))
+
+    def clear(self):
+        for queue in self.queues:
+            queue.clear()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues)
+
+    def __iter__(self):
+        return chain.from_iterable(self.queues)
+
+    def quantum(self, process):
+        return self.base_quantum * 2 ** self._level(process)
+
+    def should_preempt(self, running):
+        if getattr(running, 'mlfq_boosted', False):
+            # Already counts as level 0, which nothing outranks
+            return False
+        level = self._level(running)
+        return any(self.queues[i] for i in range(level))
+
+    def on_quantum_expired(self, process):
+        if getattr(process, 'mlfq_boosted', False):
+            return
+        process.mlfq_level = min(self._level(process) + 1, len(self.queues) - 1)
+
+    def tick(self, dt, running):
+        self.boost_timer += dt
+        if self.boost_timer < self.boost_interval:
+            return
+        # Priority boost: amortised over boost_interval, not per tick
+        self.boost_timer = 0.0
+        top = self.queues[0]
+        for queue in self.queues[1:]:
+            for process in queue:
+                process.mlfq_level = 0
+            top.extend(queue)
+            queue.clear()
+        if running is not None:
+            # Changing its level now would shrink the quantum it is part-way through
+            running.mlfq_boosted = True
+
+    def snapshot(self):
+        return {'boost_timer': self.boost_timer}
+
+    def restore(self, state):
+        self.boost_timer = state.get('boost_timer', 0.0)
+
+
+def make_policy(algorithm_type, time_quantum=2.0):
+    if algorithm_type == 'rr':
+        return RoundRobinPolicy(time_quantum)
+    elif algorithm_type == 'sjf':
+        return SJFPolicy()
+    elif algorithm_type == 'srtf':
+        return SRTFPolicy()
+    elif algorithm_type == 'priority':
+        return PriorityPolicy()
+    elif algorithm_type == 'priority_p':
+        return PreemptivePriorityPolicy()
+    elif algorithm_type == 'mlfq':
+        return MLFQPolicy()
+    return FCFSPolicy()
@@ -1,12 +1,19 @@
-from flask import Flask, render_template
+from flask import Flask, Response, abort, request
 from flask_socketio import SocketIO, emit
 import threading
 import time
-from web_game_engine import WebLineCrossingGame
+from web_game_engine import LEVEL_CONFIGS, QUEUE_PAGE_SIZE, WebLineCrossingGame, new_game
+from web_assets import AssetCache
+from web_metrics import TARGET_TICK_INTERVAL, CountingJSON, MetricsWriter, ServerTelemetry, render_metrics
+from web_streams import StreamRegistry
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'cpu_scheduling_game'
-socketio = SocketIO(app, cors_allowed_origins="*")
+telemetry = ServerTelemetry()
+socketio = SocketIO(app, cors_allowed_origins="*", json=CountingJSON(telemetry.bytes_emitted))
+streams = StreamRegistry()
+assets = AssetCache(app, ['index.html', 'tutorial.html'])
+assets.build()
 
 class WebGameController:
     def __init__(self):
@@ -14,45 +21,92 @@ class WebGameController:
         self.running = False
         self.paused = False
         self.game_thread = None
+        self.frame_count = 0
+        # Held while the loop advances the game and builds a frame, and by every handler
+        # that reads the queue, changes the game or swaps in a new one
+        self.lock = threading.Lock()
         
     def start_game_loop(self):
         self.running = True
+        # Ticks follow a fixed 30 Hz schedule, so time spent working is not added to the interval
+        deadline = time.monotonic() + TARGET_TICK_INTERVAL
         while self.running:
             if not self.paused:
+                tick_start = time.perf_counter()
                 dt = 1/30
-                self.game.update(dt)
-                game_state = self.game.get_state()
-                socketio.emit('game_update', game_state)
-            time.sleep(1/30)
+                with self.lock:
+                    self.game.update(dt)
+                    game_state = self.game.get_state()
+                self.frame_count += 1
+                game_state['frame'] = self.frame_count
+                streams.broadcast(socketio, 'game_update', game_state)
+                telemetry.record_tick(time.perf_counter() - tick_start, time.monotonic(), deadline)
+            else:
+                telemetry.loop_idle()
+            now = time.monotonic()
+            if now < deadline:
+                time.sleep(deadline - now)
+            else:
+                # Behind schedule: start the next tick now instead of bursting to catch up
+                deadline = now
+            deadline += TARGET_TICK_INTERVAL
+        telemetry.loop_idle()
 
 game_controller = WebGameController()
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return assets.page_response('index.html')
 
 @app.route('/tutorial')
 def tutorial():
-    return render_template('tutorial.html')
+    return assets.page_response('tutorial.html')
 
+@app.route('/assets/<path:filename>')
+def hashed_asset(filename):
+    response = assets.asset_response(filename)
+    if response is None:
+        abort(404)
+    return response
+
+@app.route('/metrics')
+def metrics():
+    return Response(render_metrics(telemetry, game_controller.game.scheduler, streams.stats()),
+                    content_type=MetricsWriter.CONTENT_TYPE)
 
 
 @socketio.on('connect')
 def handle_connect():
     # Reset game on new connection
-    game_controller.game = WebLineCrossingGame()
-    game_controller.running = False
-    game_controller.paused = False
+    game = new_game(high_scores=game_controller.game.high_scores)
+    with game_controller.lock:
+        game_controller.game = game
+        game_controller.running = False
+        game_controller.paused = False
+        state = game.get_state()
     print("Client connected, sending initial game state")
-    emit('game_update', game_controller.game.get_state())
+    telemetry.session_opened()
+    streams.add(request.sid)
+    emit('game_update', state)
+
+@socketio.on('disconnect')
+def handle_disconnect():
+    telemetry.session_closed()
+    streams.remove(request.sid)
 
 @socketio.on('select_difficulty')
 def handle_select_difficulty(data):
-    difficulty = data['difficulty']
-    game_controller.game = WebLineCrossingGame(difficulty)
-    game_controller.running = False
-    game_controller.paused = False
-    emit('game_update', game_controller.game.get_state())
+    difficulty = data.get('difficulty') if isinstance(data, dict) else None
+    # Only known levels build a game; anything else leaves the current game running
+    if difficulty not in LEVEL_CONFIGS:
+        return
+    game = new_game(difficulty, game_controller.game.high_scores)
+    with game_controller.lock:
+        game_controller.game = game
+        game_controller.running = False
+        game_controller.paused = False
+        state = game.get_state()
+    emit('game_update', state)
 
 @socketio.on('start_game')
 def handle_start_game():
@@ -67,35 +121,54 @@ def handle_pause_game():
 
 @socketio.on('reset_game')
 def handle_reset_game():
-    game_controller.game.reset_game()
+    with game_controller.lock:
+        game_controller.game.reset_game()
 
 @socketio.on('switch_scheduler')
 def handle_switch_scheduler():
-    game_controller.game.scheduler.switch_scheduler()
+    with game_controller.lock:
+        game_controller.game.scheduler.switch_scheduler()
 
 @socketio.on('select_algorithm')
 def handle_select_algorithm(data):
-    game_controller.game.scheduler.select_algorithm(data['index'])
+    with game_controller.lock:
+        game_controller.game.scheduler.select_algorithm(data['index'])
 
 @socketio.on('set_speed')
 def handle_set_speed(data):
-    game_controller.game.set_process_speed(data['speed'])
+    with game_controller.lock:
+        game_controller.game.set_process_speed(data['speed'])
 
 @socketio.on('player_move')
 def handle_player_move(data):
     dx, dy = data['dx'], data['dy']
-    game_controller.game.move_player(dx, dy)
+    with game_controller.lock:
+        game_controller.game.move_player(dx, dy)
+
+@socketio.on('request_queue')
+def handle_request_queue(data=None):
+    data = data if isinstance(data, dict) else {}
+    try:
+        page_number = int(data.get('page', 0))
+        page_size = int(data.get('page_size', QUEUE_PAGE_SIZE))
+    except (TypeError, ValueError):
+        emit('queue_page', {'error': 'page and page_size must be integers'})
+        return
+    with game_controller.lock:
+        page = game_controller.game.get_queue_page(page_number, page_size)
+    emit('queue_page', page)
 
 @socketio.on('request_metrics')
 def handle_request_metrics():
     metrics_data = {
         'comparison': game_controller.game.scheduler.algorithm_metrics,
-        'total_processes': len(game_controller.game.scheduler.completed_processes),
+        'total_processes': game_controller.game.scheduler.completed_count,
         'context_switches': game_controller.game.scheduler.context_switches,
-        'fps_stats': {'average': 30.0},
-        'fps_history': [30] * 60,
+        'fps_stats': {'average': telemetry.ticks.current_rate(time.monotonic())},
+        'fps_history': telemetry.fps_history(),
         'algorithm_stats': game_controller.game.scheduler.algorithm_metrics,
-        'gantt_data': []
+        'gantt_data': [],
+        'stream_stats': streams.stats().get(request.sid, {})
     }
     emit('metrics_update', metrics_data)
 
@@ -0,0 +1,118 @@
+import threading
+
+# Update rates a client can be moved between, fastest first (game loop runs at 30 Hz)
+UPDATE_RATES = (30, 15, 10)
+# Packets allowed to sit in a client's Engine.IO queue before it counts as behind
+MAX_BACKLOG = 2
+# Consecutive held frames before downgrading a client
+DOWNGRADE_AFTER = 3
+# Seconds of clean sends before trying the next faster rate
+UPGRADE_AFTER_SECONDS = 2.0
+
+
+def transport_backlog(socketio, sid, namespace='/'):
+    """Number of packets queued on the client's Engine.IO socket but not yet written"""
+    server = socketio.server
+    try:
+        eio_sid = server.manager.eio_sid_from_sid(sid, namespace)
+        eio_socket = server.eio.sockets.get(eio_sid)
+        return eio_socket.queue.qsize() if eio_socket else 0
+    except (AttributeError, KeyError):
+        return 0
+
+
+class ClientStream:
+    """Per-client send slot that only keeps the latest frame"""
+
+    def __init__(self, sid, loop_rate=UPDATE_RATES[0]):
+        self.sid = sid
+        self.loop_rate = loop_rate
+        self.rate_index = 0
+        self.pending = None
+        self.ticks_since_send = 0
+        self.held_ticks = 0
+        self.clean_sends = 0
+        self.frames_sent = 0
+        self.frames_conflated = 0
+        self.downgrades = 0
+        self.upgrades = 0
+
+    @property
+    def update_rate(self):
+        return UPDATE_RATES[self.rate_index]
+
+    def offer(self, frame):
+        """Queue a frame, replacing (conflating) any frame the client has not received yet"""
+        if self.pending is not None:
+            self.frames_conflated += 1
+        self.pending = frame
+        self.ticks_since_send += 1
+
+    def take(self, backlog):
+        """Return the frame to send this tick, or None if the client is not due or is behind"""
+        if self.pending is None or self.ticks_since_send < self.loop_rate // self.update_rate:
+            return None
+
+        if backlog > MAX_BACKLOG:
+            self.clean_sends = 0
+            self.held_ticks += 1
+            if self.held_ticks >= DOWNGRADE_AFTER and self.rate_index < len(UPDATE_RATES) - 1:
+                self.rate_index += 1
+                self.downgrades += 1
+                self.held_ticks = 0
+            return None
+
+        self.held_ticks = 0
+        if backlog == 0:
+            self.clean_sends += 1
+            if self.rate_index > 0 and self.clean_sends >= UPGRADE_AFTER_SECONDS * self.update_rate:
+                self.rate_index -= 1
+                self.upgrades += 1
+                self.clean_sends = 0
+
+        frame = self.pending
+        self.pending = None
+        self.ticks_since_send = 0
+        self.frames_sent += 1
+        return frame
+
+    def stats(self):
+        return {
+            'update_rate': self.update_rate,
+            'frames_sent': self.frames_sent,
+            'frames_conflated': self.frames_conflated,
+            'downgrades': self.downgrades,
+            'upgrades': self.upgrades
+        }
+
+
+class StreamRegistry:
+    """Thread-safe set of client streams, fed once per game loop tick"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.streams = {}
+
+    def add(self, sid):
+        with self.lock:
+            self.streams[sid] = ClientStream(sid)
+
+    def remove(self, sid):
+        with self.lock:
+            self.streams.pop(sid, None)
+
+    def __len__(self):
+        return len(self.streams)
+
+    def broadcast(self, socketio, event, frame):
+        with self.lock:
+            streams = list(self.streams.values())
+        for stream in streams:
+            stream.offer(frame)
+            ready = stream.take(transport_backlog(socketio, stream.sid))
+            if ready is not None:
+                socketio.emit(event, ready, to=stream.sid)
+
+    def stats(self):
+        with self.lock:
+            return {sid: stream.stats() for sid, stream in self.streams.items()}